@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the search and simulation code in snake.py.
+
+Run every benchmark with ``python benchmark.py`` or pick some by name, e.g.
+``python benchmark.py path_memory``. Nothing here opens a pygame display.
+"""
+from collections import deque
+from queue import PriorityQueue
+import random
+import sys
+import time
+import tracemalloc
+
+from snake import (
+    GRID_HEIGHT, GRID_WIDTH, INIT_LENGTH, WIDTH, HEIGHT, Bitboard, Board, Food, Grid,
+    Position, SearchBasedPlayer, SearchType, SimulationEngine, Snake, VectorSnakeEnv,
+)
+
+
+def path_copy_bfs(grid, start, goal, body, obstacles):
+    # Reference BFS that carries a full path list per frontier entry, the way
+    # the searches did before they switched to parent pointers.
+    queue = deque([(start, [start])])
+    visited = set()
+    while queue:
+        (current, path) = queue.popleft()
+        if current not in visited:
+            if current == goal:
+                return path
+            visited.add(current)
+            for next_pos in grid.neighbors[current]:
+                if (next_pos not in visited and
+                    next_pos not in obstacles and
+                    next_pos not in body):
+                    queue.append((next_pos, path + [next_pos]))
+    return []
+
+
+def priority_queue_dijkstra(grid, start, goal, body, obstacles):
+    # Reference Dijkstra on queue.PriorityQueue, as used before the searches
+    # moved to heapq. Returns the number of expanded cells.
+    parent = [-1] * grid.size
+    pq = PriorityQueue()
+    counter = 0
+    pq.put((0, counter, start, start))
+    expanded = 0
+    while not pq.empty():
+        cost, _, current, came_from = pq.get()
+        if parent[current] != -1:
+            continue
+        parent[current] = came_from
+        expanded += 1
+        if current == goal:
+            break
+        for next_pos in grid.neighbors[current]:
+            if parent[next_pos] != -1 or next_pos in body:
+                continue
+            new_cost = cost + (10 if next_pos in obstacles else 1)
+            counter += 1
+            pq.put((new_cost, counter, next_pos, current))
+    return expanded
+
+
+def random_board(grid, obstacle_ratio, seed=0):
+    """Return (start, obstacles) with obstacle_ratio of the cells blocked."""
+    rng = random.Random(seed)
+    cells = rng.sample(range(grid.size), int(grid.size * obstacle_ratio) + 1)
+    return cells[0], set(cells[1:])
+
+
+def rejection_place(nodes, rng):
+    # Reference placement by drawing random cells until one misses the
+    # occupied set, the way GameNode.randomize_position used to work
+    # (iterative here, the original recursed).
+    while True:
+        candidate = Position(rng.randint(0, GRID_WIDTH - 1), rng.randint(0, GRID_HEIGHT - 1))
+        if candidate not in nodes:
+            return candidate
+
+
+def measure_time(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def per_second(count, func, *args, repeat=3):
+    best = min(measure_time(func, *args) for _ in range(repeat))
+    return count / best
+
+
+def measure(func, *args):
+    """Return (result, seconds, peak traced bytes) for one call of func."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_path_memory(size=100):
+    """Peak memory of a corner-to-corner BFS on an empty size x size board."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    start, goal = 0, grid.size - 1
+
+    copied, copy_time, copy_peak = measure(path_copy_bfs, grid, start, goal, set(), set())
+    parent, parent_time, parent_peak = measure(player.bfs, start, goal, set(), set())
+    assert len(copied) == len(parent)
+
+    print(f"path_memory ({size}x{size}, path length {len(parent)})")
+    print(f"  path copies   : {copy_peak / 1024:10.1f} KiB peak, {copy_time * 1000:8.1f} ms")
+    print(f"  parent array  : {parent_peak / 1024:10.1f} KiB peak, {parent_time * 1000:8.1f} ms")
+
+
+def bench_frontier(size=100):
+    """Expansions/second of full-board Dijkstra and A* per frontier type."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    start, obstacles = random_board(grid, 0.1)
+    # The goal sits inside the body so it is never reached and every other
+    # cell gets expanded exactly once.
+    goal = (start + grid.size // 2) % grid.size
+    body = {goal}
+    expanded = priority_queue_dijkstra(grid, start, goal, body, obstacles)
+
+    print(f"frontier ({size}x{size}, {expanded} expansions per search)")
+    for name, func, args in (
+        ("PriorityQueue dijkstra", priority_queue_dijkstra, (grid,)),
+        ("heapq dijkstra", player.dijkstra, ()),
+        ("heapq astar", player.astar, ()),
+    ):
+        rate = per_second(expanded, func, *args, start, goal, body, obstacles)
+        print(f"  {name:24}: {rate:12,.0f} expansions/s")
+
+
+def bench_dial(size=200, searches=20):
+    """Mean latency of obstacle-aware shortest paths, heapq vs Dial buckets."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    _, obstacles = random_board(grid, 0.1)
+    rng = random.Random(1)
+    pairs = [(rng.randrange(grid.size), rng.randrange(grid.size)) for _ in range(searches)]
+
+    print(f"dial ({size}x{size}, {searches} random start/goal pairs)")
+    for name, func in (("heapq dijkstra", player.dijkstra), ("dial", player.dial)):
+        elapsed = sum(measure_time(func, start, goal, set(), obstacles) for start, goal in pairs)
+        print(f"  {name:24}: {elapsed / searches * 1000:8.2f} ms/search")
+
+
+def bench_bitboard(size=100):
+    """Flood fill of a whole board: bitboard wavefronts vs per-cell BFS."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    start, obstacles = random_board(grid, 0.2)
+    board = Bitboard(size, size)
+    for cell in obstacles:
+        board.obstacles |= 1 << cell
+    goal = (start + grid.size // 2) % grid.size
+    board.body = 1 << goal  # unreachable goal: BFS has to flood the board
+
+    region = board.flood_fill(start)
+    bfs_time = min(measure_time(player.bfs, start, goal, {goal}, obstacles) for _ in range(3))
+    fill_time = min(measure_time(board.flood_fill, start) for _ in range(3))
+
+    print(f"bitboard ({size}x{size}, {Bitboard.count(region)} reachable cells)")
+    print(f"  per-cell bfs            : {bfs_time * 1000:8.2f} ms")
+    print(f"  bitboard flood fill     : {fill_time * 1000:8.2f} ms")
+
+
+def bench_distance_field(size=100):
+    """Walking head -> food: a bfs every tick vs one cached distance field."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    start, obstacles = random_board(grid, 0.2)
+    rng = random.Random(2)
+    route = []
+    while len(route) < size:  # pick a goal at least size steps away
+        goal = rng.randrange(grid.size)
+        route = player.bfs(start, goal, set(), obstacles)
+
+    begin = time.perf_counter()
+    for cell in route:
+        player.bfs(cell, goal, set(), obstacles)
+    bfs_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    cell = start
+    while cell != goal:
+        cell = player.descend_distance_field(cell, goal, set(), obstacles)[1]
+    field_time = time.perf_counter() - begin
+
+    print(f"distance_field ({size}x{size}, route of {len(route)} steps)")
+    print(f"  bfs every tick          : {bfs_time * 1000:8.1f} ms")
+    print(f"  distance field descent  : {field_time * 1000:8.1f} ms")
+
+
+def bench_vector_env(num_games=8192, ticks=200):
+    """Game-steps/second of VectorSnakeEnv under its greedy policy."""
+    env = VectorSnakeEnv(num_games, seed=0)
+    begin = time.perf_counter()
+    for _ in range(ticks):
+        env.step(env.greedy_actions())
+    elapsed = time.perf_counter() - begin
+
+    print(f"vector_env ({num_games} games x {ticks} ticks)")
+    print(f"  {env.steps / elapsed:12,.0f} game-steps/s")
+
+
+def bench_placement(free=4, placements=2000):
+    """Food placement on a board with only `free` empty cells left."""
+    rng = random.Random(0)
+    size = GRID_WIDTH * GRID_HEIGHT
+    taken = rng.sample(range(size), size - free)
+
+    nodes = {Position(cell % GRID_WIDTH, cell // GRID_WIDTH) for cell in taken}
+    rejection_time = measure_time(lambda: [rejection_place(nodes, rng) for _ in range(placements)])
+
+    board = Board()
+    for cell in taken:
+        board.take(cell)
+    food = Food(board, rng)
+    index_time = measure_time(lambda: [food.randomize_position() for _ in range(placements)])
+
+    print(f"placement ({GRID_WIDTH}x{GRID_HEIGHT}, {free} free cells)")
+    print(f"  rejection sampling      : {rejection_time / placements * 1e6:8.1f} us/placement")
+    print(f"  free-cell index         : {index_time / placements * 1e6:8.1f} us/placement")
+
+
+def draw_checkerboard(surface):
+    # Reference per-frame background: the 400 draw_node calls drawGrid used
+    # to issue on every frame
+    from snake import BRIGHT_BG, DARK_BG
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            p = Position(x, y)
+            if (x + y) % 2 == 0:
+                p.draw_node(surface, BRIGHT_BG, BRIGHT_BG)
+            else:
+                p.draw_node(surface, DARK_BG, DARK_BG)
+
+
+def bench_background(frames=200):
+    """Per-frame cost of the checkerboard: redrawn vs blitted from a cache."""
+    import pygame  # only this benchmark draws; offscreen surfaces need no display
+
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    background = pygame.Surface((WIDTH, HEIGHT))
+    draw_checkerboard(background)
+
+    redraw_time = measure_time(lambda: [draw_checkerboard(surface) for _ in range(frames)])
+    blit_time = measure_time(lambda: [surface.blit(background, (0, 0)) for _ in range(frames)])
+
+    print(f"background ({WIDTH}x{HEIGHT} px, {GRID_WIDTH}x{GRID_HEIGHT} cells)")
+    print(f"  redraw every frame      : {redraw_time / frames * 1000:8.3f} ms/frame")
+    print(f"  cached surface blit     : {blit_time / frames * 1000:8.3f} ms/frame")
+
+
+def bench_replanning(size=100, length=200, ticks=100, moved=5):
+    """
+    Per-tick replanning toward a fixed food while the snake moves and
+    `moved` obstacles jump to new cells every tick: a fresh astar each tick
+    vs the LPA* and D* Lite planners repairing their previous search.
+    """
+    grid = Grid(size, size)
+    rng = random.Random(3)
+    _, obstacles = random_board(grid, 0.1)
+    goal = grid.size - 1
+    # The body folds along the first two rows with the head at (0, 1) and the
+    # food in the opposite corner
+    body = deque(list(range(size, 2 * size)) + list(range(size - 1, -1, -1)))
+    for _ in range(2 * size - length):
+        body.pop()
+    obstacles -= set(range(3 * size)) | {goal}
+
+    # Replay the same ticks for every player: the head follows astar's path
+    ticks_played = []
+    fresh = SearchBasedPlayer(SearchType.ASTAR, grid)
+    for _ in range(ticks):
+        path = fresh.astar(body[0], goal, set(body), obstacles)
+        if len(path) < 2:
+            break
+        ticks_played.append((body[0], set(body), set(obstacles)))
+        body.appendleft(path[1])
+        body.pop()
+        obstacles -= set(rng.sample(sorted(obstacles), moved))
+        while len(ticks_played[-1][2]) > len(obstacles):
+            cell = rng.randrange(3 * size, goal)
+            if cell not in body:
+                obstacles.add(cell)
+
+    print(f"replanning ({size}x{size}, snake of {length}, {moved} obstacles moved per tick, "
+          f"{len(ticks_played)} replans)")
+    for name, method in (("fresh astar", "astar"),
+                         ("LPA* repair", "lpa_star"),
+                         ("D* Lite repair", "dstar_lite")):
+        player = SearchBasedPlayer(grid=grid)
+        search = getattr(player, method)
+        head, blocked, cells = ticks_played[0]
+        search(head, goal, blocked, cells)  # the incremental planners start with a full plan
+        expanded, reexpanded = player.nodes_expanded, player.nodes_reexpanded
+        begin = time.perf_counter()
+        for head, blocked, cells in ticks_played[1:]:
+            search(head, goal, blocked, cells)
+        elapsed = time.perf_counter() - begin
+        replans = len(ticks_played) - 1
+        print(f"  {name:24}: {elapsed / replans * 1000:8.2f} ms/replan, "
+              f"{(player.nodes_expanded - expanded) / replans:8.0f} expanded, "
+              f"{(player.nodes_reexpanded - reexpanded) / replans:8.0f} re-expanded per replan")
+
+
+def bench_jps(size=256, searches=10):
+    """Expansions and latency on sparse boards, astar vs jump point search."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    rng = random.Random(4)
+    print(f"jps ({size}x{size}, {searches} random start/goal pairs, obstacles blocked)")
+    for ratio in (0.01, 0.1):
+        _, obstacles = random_board(grid, ratio)
+        free = [cell for cell in range(grid.size) if cell not in obstacles]
+        pairs = [rng.sample(free, 2) for _ in range(searches)]
+        # astar would pay OBSTACLE_COST to cross obstacles; pass them as body
+        # cells so both searches treat them as walls
+        for name, func, body, cells in (("astar", player.astar, obstacles, set()),
+                                        ("jps", player.jps, set(), obstacles)):
+            player.nodes_expanded = 0
+            elapsed = sum(measure_time(func, start, goal, body, cells) for start, goal in pairs)
+            print(f"  {ratio:4.0%} {name:19}: {elapsed / searches * 1000:8.2f} ms/search, "
+                  f"{player.nodes_expanded / searches:8.0f} expansions/search")
+
+
+def bench_bidirectional(size=200, searches=20):
+    """Cells expanded on an open board, bfs vs bidirectional bfs."""
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid)
+    _, obstacles = random_board(grid, 0.01)
+    rng = random.Random(5)
+    free = [cell for cell in range(grid.size) if cell not in obstacles]
+    pairs = [rng.sample(free, 2) for _ in range(searches)]
+
+    print(f"bidirectional ({size}x{size}, 1% obstacles, {searches} random start/goal pairs)")
+    for name, func in (("bfs", player.bfs), ("bidirectional bfs", player.bidirectional_bfs)):
+        player.nodes_expanded = 0
+        elapsed = sum(measure_time(func, start, goal, set(), obstacles) for start, goal in pairs)
+        print(f"  {name:24}: {elapsed / searches * 1000:8.2f} ms/search, "
+              f"{player.nodes_expanded / searches:8.0f} expansions/search")
+
+
+def bench_deadline(size=200, searches=40, deadline_ms=5.0):
+    """
+    Per-search latency (p50/p99/max) on a cluttered board where a quarter
+    of the goals are walled in by body cells: dijkstra and astar run to
+    completion, the anytime search stops at deadline_ms.
+    """
+    grid = Grid(size, size)
+    player = SearchBasedPlayer(grid=grid, deadline_ms=deadline_ms)
+    _, obstacles = random_board(grid, 0.3)
+    rng = random.Random(6)
+    cases = []
+    for index in range(searches):
+        start, goal = rng.sample(range(grid.size), 2)
+        body = set(grid.neighbors[goal]) if index % 4 == 0 else set()
+        cases.append((start, goal, body - {start}, obstacles - {start, goal}))
+
+    print(f"deadline ({size}x{size}, 30% obstacles, {searches} searches, "
+          f"{searches // 4} unreachable goals, {deadline_ms:g} ms budget)")
+    for name, func in (("dijkstra", player.dijkstra), ("astar", player.astar),
+                       ("anytime", player.anytime)):
+        times = sorted(measure_time(func, *case) * 1000 for case in cases)
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+        print(f"  {name:24}: p50 {times[len(times) // 2]:8.2f} ms, p99 {p99:8.2f} ms, "
+              f"max {times[-1]:8.2f} ms")
+    print(f"  anytime searches cut short by their budget: {player.budget_misses}")
+
+
+def bench_board_memory(rounds=4, games=100, ticks=50):
+    """Memory still allocated after repeatedly creating and dropping games."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    print(f"board_memory ({games} concurrent games per round, {ticks} ticks each)")
+    for round_index in range(rounds):
+        engines = []
+        for seed in range(games):
+            rng = random.Random(round_index * games + seed)
+            snake = Snake(WIDTH, HEIGHT, INIT_LENGTH, rng)
+            engines.append(SimulationEngine(snake, SearchBasedPlayer(SearchType.ASTAR), rng=rng))
+        for _ in range(ticks):
+            for engine in engines:
+                engine.step()
+        live = tracemalloc.get_traced_memory()[0] - baseline
+        del engines, engine, snake
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        print(f"  round {round_index}: {live / 1024:8.1f} KiB live, "
+              f"{retained / 1024:6.1f} KiB retained after dropping them")
+    tracemalloc.stop()
+
+
+BENCHMARKS = {
+    "path_memory": bench_path_memory,
+    "frontier": bench_frontier,
+    "dial": bench_dial,
+    "bitboard": bench_bitboard,
+    "distance_field": bench_distance_field,
+    "vector_env": bench_vector_env,
+    "placement": bench_placement,
+    "board_memory": bench_board_memory,
+    "background": bench_background,
+    "replanning": bench_replanning,
+    "jps": bench_jps,
+    "bidirectional": bench_bidirectional,
+    "deadline": bench_deadline,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
-from typing import List, Set
+from __future__ import annotations
+from typing import Deque, List, Set
+from collections import deque
 from dataclasses import dataclass
-import pygame
 from enum import Enum, unique
+from functools import lru_cache
 import sys
 import random
+import time
+
+try:
+    import pygame
+except ImportError:  # headless runs through SimulationEngine never draw
+    pygame = None
 
 
 FPS = 10
+MAX_LAG = 0.25  # seconds the simulation may fall behind before ticks are dropped
 
 INIT_LENGTH = 4
 
@@ -66,65 +75,236 @@ class Position:
         return hash(str(self))
 
 
-class GameNode:
-    nodes: Set[Position] = set()
+class FreeCells:
+    """
+    Index of the cells (see Grid) that nothing occupies, for O(1) uniform
+    sampling of an empty cell.
+
+    Free cells live in a dense array plus a cell -> slot map, so take() can
+    swap-remove a cell and release() can append it back in O(1). Cells keep
+    an occupancy count because things may overlap (the head sitting on food
+    or running over an obstacle); a cell is free only when its count is 0.
+    """
+
+    def __init__(self, size: int = GRID_WIDTH * GRID_HEIGHT):
+        self.cells = list(range(size))
+        self.slot = list(range(size))  # -1 for occupied cells
+        self.count = [0] * size
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell: int):
+        return self.slot[cell] != -1
+
+    def take(self, cell: int):
+        self.count[cell] += 1
+        if self.count[cell] == 1:
+            slot = self.slot[cell]
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[slot] = last
+                self.slot[last] = slot
+            self.slot[cell] = -1
+
+    def release(self, cell: int):
+        self.count[cell] -= 1
+        if self.count[cell] == 0:
+            self.slot[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def sample(self, rng=random) -> int:
+        """A uniformly random free cell; IndexError once the board is full."""
+        if not self.cells:
+            raise IndexError("no free cell left on the board")
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class Board(FreeCells):
+    """
+    Occupancy of one game's board. The game's snake, food and obstacles
+    take and release their cells here; since each game owns its Board, any
+    number of games can run in one interpreter without seeing each other's
+    pieces or leaving cells behind once they are dropped.
+    """
+
+    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT):
+        super(Board, self).__init__(width * height)
+        self.grid = Grid(width, height)  # cell <-> Position
+
+
+class ObstacleIndex:
+    """
+    A game's obstacles, indexed by cell (encoded by grid, as in
+    Snake.occupied).
+
+    Keeps a cell -> obstacle map, the set of obstacle cells handed to the
+    searches and a bitmap (an int with bit `cell` set). add() and discard()
+    update all three incrementally; to move an obstacle, discard it, change
+    its position and add it back. Iterating yields the Obstacle objects, so
+    code written against a Set[Obstacle] keeps working.
+    """
+
+    def __init__(self, obstacles=(), grid: Grid = None):
+        self.grid = grid if grid is not None else Grid()
+        self.by_cell = {}
+        self.cells: Set[int] = set()
+        self.bitmap = 0
+        for ob in obstacles:
+            self.add(ob)
+
+    def __iter__(self):
+        return iter(self.by_cell.values())
+
+    def __len__(self):
+        return len(self.by_cell)
+
+    def add(self, obstacle: Obstacle):
+        cell = self.grid.encode(obstacle.position)
+        self.by_cell[cell] = obstacle
+        self.cells.add(cell)
+        self.bitmap |= 1 << cell
+
+    def discard(self, obstacle: Obstacle):
+        cell = self.grid.encode(obstacle.position)
+        if self.by_cell.get(cell) is obstacle:
+            del self.by_cell[cell]
+            self.cells.discard(cell)
+            self.bitmap &= ~(1 << cell)
+
+    def at(self, pos: Position):
+        """Return the obstacle on pos, or None."""
+        if pos.check_bounds(self.grid.width, self.grid.height):
+            return None
+        return self.by_cell.get(self.grid.encode(pos))
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(width: int, height: int) -> tuple:
+    """
+    In-bounds neighbors of every cell of a width x height grid, in Direction
+    order. Built once per grid size and shared by every Grid of that size.
+    """
+    table = []
+    for cell in range(width * height):
+        x, y = cell % width, cell // width
+        adjacent = []
+        for direction in Direction:
+            nx, ny = x + direction.value[0], y + direction.value[1]
+            if 0 <= nx < width and 0 <= ny < height:
+                adjacent.append(ny * width + nx)
+        table.append(tuple(adjacent))
+    return tuple(table)
+
+
+class Grid:
+    """
+    Integer cell encoding of a width x height board.
+
+    Cell (x, y) is stored as y * width + x. Searches work on these ints and
+    the precomputed neighbor table, and only convert back to Position once a
+    path has been found.
+    """
+
+    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.neighbors = neighbor_table(width, height)
+
+    def encode(self, pos: Position) -> int:
+        return pos.y * self.width + pos.x
+
+    def decode(self, cell: int) -> Position:
+        return Position(cell % self.width, cell // self.width)
+
+    def encode_all(self, positions) -> Set[int]:
+        return {
+            p.y * self.width + p.x
+            for p in positions
+            if not p.check_bounds(self.width, self.height)
+        }
 
-    def __init__(self):
+
+class GameNode:
+    def __init__(self, board: Board, rng=None):
         self.position = Position(0, 0)
         self.color = (0, 0, 0)
+        # The game's Board tracks which cells are taken
+        self.board = board
+        # A game-owned random.Random; the global random module if not given
+        self.rng = rng if rng is not None else random
+        self.placed = False
 
     def randomize_position(self):
-        try:
-            GameNode.nodes.remove(self.position)
-        except KeyError:
-            pass
-
-        condidate_position = Position(
-            random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1),
-        )
-
-        if condidate_position not in GameNode.nodes:
-            self.position = condidate_position
-            GameNode.nodes.add(self.position)
-        else:
-            self.randomize_position()
+        if self.placed:
+            self.board.release(self.board.grid.encode(self.position))
+        cell = self.board.sample(self.rng)
+        self.board.take(cell)
+        self.position = self.board.grid.decode(cell)
+        self.placed = True
 
     def draw(self, surface: pygame.Surface):
         self.position.draw_node(surface, self.color, BRIGHT_BG)
 
 
 class Food(GameNode):
-    def __init__(self):
-        super(Food, self).__init__()
+    def __init__(self, board: Board, rng=None):
+        super(Food, self).__init__(board, rng)
         self.color = FOOD_COL
         self.randomize_position()
 
 
 class Obstacle(GameNode):
-    def __init__(self):
-        super(Obstacle, self).__init__()
+    def __init__(self, board: Board, rng=None):
+        super(Obstacle, self).__init__(board, rng)
         self.color = OBSTACLE_COL
         self.randomize_position()
 
 
 class Snake:
-    def __init__(self, screen_width, screen_height, init_length):
+    def __init__(self, screen_width, screen_height, init_length, rng=None):
         self.color = SNAKE_COL
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.init_length = init_length
+        self.rng = rng if rng is not None else random
+        self.grid = Grid()  # encodes positions as cells; see Grid
+        self.board = None  # see set_board
         self.reset()
 
     def reset(self):
+        if self.board is not None:
+            for cell in self.occupied:
+                self.board.release(cell)
         self.length = self.init_length
-        self.positions = [Position((GRID_SIDE // 2), (GRID_SIDE // 2))]
-        self.direction = random.choice([e for e in Direction])
+        # Head at the left end: moving is appendleft() plus pop() at the tail
+        self.positions: Deque[Position] = deque(
+            [Position((GRID_SIDE // 2), (GRID_SIDE // 2))]
+        )
+        # Cells (see Grid) covered by positions, kept in sync by move() so
+        # occupancy checks don't scan the body
+        self.occupied: Set[int] = {self.grid.encode(self.positions[0])}
+        if self.board is not None:
+            self.board.take(self.grid.encode(self.positions[0]))
+        self.direction = self.rng.choice([e for e in Direction])
         self.score = 0
         self.hasReset = True
 
+    def set_board(self, board: Board):
+        """Register the body on the game's board and keep it in sync from now on."""
+        self.board = board
+        self.grid = board.grid
+        self.occupied = self.grid.encode_all(self.positions)
+        for cell in self.occupied:
+            board.take(cell)
+
     def get_head_position(self) -> Position:
         return self.positions[0]
 
+    def occupies(self, pos: Position) -> bool:
+        return self.grid.encode(pos) in self.occupied
+
     def turn(self, direction: Direction):
         if self.length > 1 and direction.reverse() == self.direction:
             return
@@ -139,18 +319,25 @@ class Snake:
         if self.collide(new):
             self.reset()
         else:
-            self.positions.insert(0, new)
+            self.positions.appendleft(new)
+            self.occupied.add(self.grid.encode(new))
+            if self.board is not None:
+                self.board.take(self.grid.encode(new))
             while len(self.positions) > self.length:
-                self.positions.pop()
+                tail = self.grid.encode(self.positions.pop())
+                self.occupied.discard(tail)
+                if self.board is not None:
+                    self.board.release(tail)
 
     def collide(self, new: Position):
-        return (new in self.positions) or (new.check_bounds(GRID_WIDTH, GRID_HEIGHT))
+        # Bounds first: an off-board position would alias a cell on the next row
+        return (new.check_bounds(self.grid.width, self.grid.height)) or self.occupies(new)
 
     def eat(self, food: Food):
         if self.get_head_position() == food.position:
             self.length += 1
             self.score += 1
-            while food.position in self.positions:
+            while self.occupies(food.position):
                 food.randomize_position()
 
     def hit_obstacle(self, obstacle: Obstacle):
@@ -169,11 +356,11 @@ class Player:
     def __init__(self) -> None:
         self.visited_color = VISITED_COL
         self.visited: Set[Position] = set()
-        self.chosen_path: List[Direction] = []
+        self.chosen_path: Deque[Direction] = deque()
 
     def move(self, snake: Snake) -> bool:
         try:
-            next_step = self.chosen_path.pop(0)
+            next_step = self.chosen_path.popleft()
             snake.turn(next_step)
             return False
         except IndexError:
@@ -196,22 +383,85 @@ class Player:
             p.draw_node(surface, self.visited_color, BRIGHT_BG)
 
 
+class SimulationEngine:
+    """
+    The game itself: board, food, obstacles and the per-tick rules (player
+    move, replanning, snake move, eat, obstacle hits).
+
+    It never touches pygame, so headless runs use it directly and tick as
+    fast as the CPU allows; SnakeGame wraps one and adds the window, input
+    and drawing.
+    """
+
+    def __init__(self, snake: Snake, player: Player, num_obstacles: int = 40, rng=None) -> None:
+        self.snake = snake
+        # Pass the same random.Random(seed) as the snake's rng to make the
+        # whole game reproducible
+        self.rng = rng if rng is not None else random
+        self.board = Board()
+        snake.set_board(self.board)
+        self.food = Food(self.board, self.rng)
+        self.obstacles = ObstacleIndex(grid=self.board.grid)
+        for _ in range(num_obstacles):
+            self.obstacles.add(Obstacle(self.board, self.rng))
+
+        self.player = player
+        self.steps = 0
+        self.elapsed = 0.0
+        self.deaths = 0
+        self.best_score = 0
+
+    def step(self):
+        if self.player.move(self.snake) or self.snake.hasReset:
+            self.player.search_path(self.snake, self.food, self.obstacles)
+            self.player.move(self.snake)
+        self.snake.move()
+        self.snake.eat(self.food)
+        ob = self.obstacles.at(self.snake.get_head_position())
+        if ob is not None:
+            self.snake.hit_obstacle(ob)
+        self.steps += 1
+        if self.snake.hasReset:
+            self.deaths += 1
+        self.best_score = max(self.best_score, self.snake.score)
+
+    def run(self, max_steps: int) -> float:
+        """
+        Advance the game by max_steps ticks and return the steps/second
+        achieved by this call.
+        """
+        start = time.perf_counter()
+        for _ in range(max_steps):
+            self.step()
+        elapsed = time.perf_counter() - start
+        self.elapsed += elapsed
+        return max_steps / elapsed if elapsed > 0 else float("inf")
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.elapsed if self.elapsed > 0 else 0.0
+
+
 class SnakeGame:
-    def __init__(self, snake: Snake, player: Player) -> None:
+    def __init__(self, snake: Snake, player: Player, rng=None,
+                 tick_rate: float = FPS, frame_rate: float = FPS) -> None:
         pygame.init()
         pygame.display.set_caption("AIFundamentals - SnakeGame")
 
+        # The game rules live in SimulationEngine; SnakeGame only adds the
+        # window, input handling and drawing around it
+        self.engine = SimulationEngine(snake, player, rng=rng)
         self.snake = snake
-        self.food = Food()
-        self.obstacles: Set[Obstacle] = set()
-        for _ in range(40):
-            ob = Obstacle()
-            while any([ob.position == o.position for o in self.obstacles]):
-                ob.randomize_position()
-            self.obstacles.add(ob)
-
+        self.rng = self.engine.rng
+        self.board = self.engine.board
+        self.food = self.engine.food
+        self.obstacles = self.engine.obstacles
         self.player = player
 
+        # Simulation ticks per second (0 for as many as fit between frames)
+        # and the cap on rendered frames per second (0 for uncapped)
+        self.tick_rate = tick_rate
+        self.frame_rate = frame_rate
         self.fps_clock = pygame.time.Clock()
 
         self.screen = pygame.display.set_mode(
@@ -219,38 +469,125 @@ class SnakeGame:
         )
         self.surface = pygame.Surface(self.screen.get_size()).convert()
         self.myfont = pygame.font.SysFont("monospace", 16)
-
-    def drawGrid(self):
+        # Checkerboard painted once by build_background and blitted per frame
+        self.background = None
+        self.background_key = None
+        # Cell -> color currently on screen (see scene); None forces a full redraw
+        self.drawn = None
+        self.score_text = None
+        self.score_text_value = None
+        self.score_rect = None
+
+    def build_background(self):
+        self.background = pygame.Surface(self.surface.get_size()).convert()
         for y in range(0, int(GRID_HEIGHT)):
             for x in range(0, int(GRID_WIDTH)):
                 p = Position(x, y)
                 if (x + y) % 2 == 0:
-                    p.draw_node(self.surface, BRIGHT_BG, BRIGHT_BG)
+                    p.draw_node(self.background, BRIGHT_BG, BRIGHT_BG)
                 else:
-                    p.draw_node(self.surface, DARK_BG, DARK_BG)
+                    p.draw_node(self.background, DARK_BG, DARK_BG)
+        self.background_key = (self.surface.get_size(), GRID_WIDTH, GRID_HEIGHT)
 
-    def run(self):
-        while not self.handle_events():
-            self.fps_clock.tick(FPS)
+    def drawGrid(self):
+        # Repaint the cached checkerboard only if the surface or grid changed
+        if self.background_key != (self.surface.get_size(), GRID_WIDTH, GRID_HEIGHT):
+            self.build_background()
+        self.surface.blit(self.background, (0, 0))
+
+    def step(self):
+        self.engine.step()
+
+    def scene(self) -> dict:
+        """
+        Color of every cell that isn't plain background, keyed by the
+        board's cell encoding. Layers are added in drawing order, so each
+        cell ends up with the color of its topmost piece.
+        """
+        encode = self.board.grid.encode
+        cells = {}
+        for ob in self.obstacles:
+            cells[encode(ob.position)] = ob.color
+        for p in self.player.visited:
+            cells[encode(p)] = self.player.visited_color
+        for p in self.snake.positions:
+            cells[encode(p)] = self.snake.color
+        cells[encode(self.food.position)] = self.food.color
+        return cells
+
+    def render(self):
+        # Only cells whose color changed since the last frame are repainted
+        # and passed to display.update, so a frame costs in proportion to
+        # what moved rather than to the size of the board
+        scene = self.scene()
+        if self.drawn is None or self.background_key != (
+            self.surface.get_size(), GRID_WIDTH, GRID_HEIGHT
+        ):
             self.drawGrid()
-            if self.player.move(self.snake) or self.snake.hasReset:
-                self.player.search_path(self.snake, self.food, self.obstacles)
-                self.player.move(self.snake)
-            self.snake.move()
-            self.snake.eat(self.food)
-            for ob in self.obstacles:
-                self.snake.hit_obstacle(ob)
             for ob in self.obstacles:
                 ob.draw(self.surface)
             self.player.draw_visited(self.surface)
             self.snake.draw(self.surface)
             self.food.draw(self.surface)
             self.screen.blit(self.surface, (0, 0))
-            text = self.myfont.render(
-                "Score {0}".format(self.snake.score), 1, (0, 0, 0)
-            )
-            self.screen.blit(text, (5, 10))
-            pygame.display.update()
+            dirty = [self.screen.get_rect()]
+        else:
+            dirty = []
+            for cell in self.drawn.keys() | scene.keys():
+                color = scene.get(cell)
+                if color == self.drawn.get(cell):
+                    continue
+                p = self.board.grid.decode(cell)
+                r = pygame.Rect((p.x * GRID_SIDE, p.y * GRID_SIDE), (GRID_SIDE, GRID_SIDE))
+                self.surface.blit(self.background, r, r)
+                if color is not None:
+                    p.draw_node(self.surface, color, BRIGHT_BG)
+                self.screen.blit(self.surface, r, r)
+                dirty.append(r)
+        self.drawn = scene
+
+        # The score sits on the screen on top of the board, so it is redrawn
+        # when it changes or when a repainted cell covered it
+        if (self.score_text_value != self.snake.score
+                or self.score_rect.collidelist(dirty) != -1):
+            if self.score_text_value != self.snake.score:
+                self.score_text = self.myfont.render(
+                    "Score {0}".format(self.snake.score), 1, (0, 0, 0)
+                )
+                self.score_text_value = self.snake.score
+            text_rect = self.score_text.get_rect(topleft=(5, 10))
+            r = text_rect.union(self.score_rect) if self.score_rect else text_rect
+            self.screen.blit(self.surface, r, r)
+            self.screen.blit(self.score_text, text_rect)
+            self.score_rect = text_rect
+            dirty.append(r)
+        if dirty:
+            pygame.display.update(dirty)
+
+    def run(self):
+        # Fixed-timestep loop: the simulation advances in steps of
+        # 1 / tick_rate seconds, catching up on however many are due, and
+        # only the state at the end of each frame is drawn. A frame_rate of 0
+        # draws as often as possible, like Clock.tick(0)
+        frame_time = 1.0 / self.frame_rate if self.frame_rate else 0.0
+        tick_time = 1.0 / self.tick_rate if self.tick_rate else 0.0
+        lag = 0.0
+        previous = time.perf_counter()
+        while not self.handle_events():
+            now = time.perf_counter()
+            lag = min(lag + now - previous, MAX_LAG)
+            previous = now
+            if tick_time:
+                while lag >= tick_time:
+                    self.step()
+                    lag -= tick_time
+            else:
+                deadline = now + frame_time
+                self.step()  # at least one tick per frame
+                while time.perf_counter() < deadline:
+                    self.step()
+            self.render()
+            self.fps_clock.tick(self.frame_rate)
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -281,106 +618,593 @@ class HumanPlayer(Player):
 
 
 # ----------------------------------
-# DO NOT MODIFY CODE ABOVE THIS LINE
+# Game core above: board, pieces, rules and rendering.
+# Search algorithms, simulators and command line below.
 # ----------------------------------
         
-from collections import deque
-from queue import PriorityQueue
+import argparse
+import csv
+import json
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # only the vectorized helpers below need numpy
+    np = None
 
 class SearchType(Enum):
     BFS = 1
     DFS = 2
     DIJKSTRA = 3
     ASTAR = 4
+    DIAL = 5
+    DISTANCE_FIELD = 6
+    DSTAR_LITE = 7
+    LPA_STAR = 8
+    JPS = 9
+    BIDIRECTIONAL_BFS = 10
+    ANYTIME = 11
+
+
+OBSTACLE_COST = 10  # Step cost of moving onto an obstacle; every other step costs 1
+INF = float("inf")
+ANYTIME_DEADLINE_MS = 5.0  # Default time budget of one anytime search
+ANYTIME_MAX_EXPANSIONS = 1000  # Its expansion budget in tournaments, which must be deterministic
+ANYTIME_WEIGHTS = (3.0, 2.0, 1.5, 1.0)  # Heuristic weights the anytime search works down through
+
+# Planners that keep their search state between calls and are meant to
+# replan on every tick; search_path only queues the first step of their path
+REPLANNING_SEARCHES = {SearchType.DSTAR_LITE, SearchType.LPA_STAR}
+
+
+def reconstruct_path(parent: List[int], goal: int) -> List[int]:
+    """
+    Walk a flat parent array back from goal and return the path start..goal.
+
+    The start cell is its own parent; cells never reached hold -1.
+    """
+    path = [goal]
+    cell = goal
+    while parent[cell] != cell:
+        cell = parent[cell]
+        path.append(cell)
+    path.reverse()
+    return path
+
+
+class Bitboard:
+    """
+    Whole-board state as Python ints with one bit per cell (bit y * width + x,
+    the same encoding as Grid and Snake.occupied).
+
+    obstacles, body and food are separate layers; free() is every cell that
+    is neither obstacle nor body. BFS is done a whole wavefront at a time:
+    expand() moves every bit of a frontier one step in each Direction with
+    shifts, masking the columns that would otherwise wrap into the next row,
+    so reachability and flood fills take one big-int operation per BFS layer
+    instead of one Python loop iteration per cell.
+    """
+
+    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.full = (1 << self.size) - 1
+        first_column = 0
+        for y in range(height):
+            first_column |= 1 << (y * width)
+        self.not_first_column = self.full & ~first_column
+        self.not_last_column = self.full & ~(first_column << (width - 1))
+        self.obstacles = 0
+        self.body = 0
+        self.food = 0
+
+    @classmethod
+    def from_game(cls, snake: Snake, food: Food, obstacles) -> Bitboard:
+        board = cls(snake.grid.width, snake.grid.height)
+        for cell in snake.occupied:
+            board.body |= 1 << cell
+        board.food = 1 << snake.grid.encode(food.position)
+        if isinstance(obstacles, ObstacleIndex):
+            board.obstacles = obstacles.bitmap
+        else:
+            for ob in obstacles:
+                board.obstacles |= 1 << snake.grid.encode(ob.position)
+        return board
+
+    def free(self) -> int:
+        return self.full & ~(self.obstacles | self.body)
+
+    def expand(self, frontier: int, passable: int) -> int:
+        """Cells of passable that are one step from any cell of frontier."""
+        width = self.width
+        grown = (
+            (frontier >> width)  # UP
+            | (frontier << width)  # DOWN
+            | ((frontier & self.not_first_column) >> 1)  # LEFT
+            | ((frontier & self.not_last_column) << 1)  # RIGHT
+        )
+        return grown & passable
+
+    def wavefronts(self, start: int, passable: int = None, goal: int = None) -> List[int]:
+        """
+        BFS layers from cell start: entry k holds the cells first reached
+        after k steps. Stops early once goal is reached.
+        """
+        if passable is None:
+            passable = self.free()
+        frontier = seen = 1 << start
+        layers = [frontier]
+        while not (goal is not None and (frontier >> goal) & 1):
+            frontier = self.expand(frontier, passable) & ~seen
+            if not frontier:
+                break
+            seen |= frontier
+            layers.append(frontier)
+        return layers
+
+    def flood_fill(self, start: int, passable: int = None) -> int:
+        """Mask of every cell reachable from cell start."""
+        if passable is None:
+            passable = self.free()
+        frontier = seen = 1 << start
+        while frontier:
+            frontier = self.expand(frontier, passable) & ~seen
+            seen |= frontier
+        return seen
+
+    def reachable(self, start: int, goal: int, passable: int = None) -> bool:
+        layers = self.wavefronts(start, passable, goal)
+        return bool((layers[-1] >> goal) & 1)
+
+    def shortest_path(self, start: int, goal: int, passable: int = None) -> List[int]:
+        """
+        Shortest path start..goal as a list of cells, or [] if goal can't be
+        reached. Found by walking back through the wavefronts.
+        """
+        layers = self.wavefronts(start, passable, goal)
+        if not (layers[-1] >> goal) & 1:
+            return []
+        neighbors = neighbor_table(self.width, self.height)
+        path = [goal]
+        cell = goal
+        for layer in reversed(layers[:-1]):
+            for next_cell in neighbors[cell]:
+                if (layer >> next_cell) & 1:
+                    cell = next_cell
+                    break
+            path.append(cell)
+        path.reverse()
+        return path
+
+    @staticmethod
+    def count(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+def distance_field(blocked_cells, width: int, height: int, goal: int):
+    """
+    BFS distance from cell goal to every cell of a width x height board,
+    returned as a height x width NumPy array. Each NumPy operation advances a
+    whole wavefront. Blocked and unreachable cells get -1.
+    """
+    if np is None:
+        raise ImportError("distance_field requires numpy")
+    blocked = np.zeros(width * height, dtype=bool)
+    blocked[list(blocked_cells)] = True
+    blocked[goal] = False
+    blocked = blocked.reshape(height, width)
+    goal_y, goal_x = divmod(goal, width)
+    passable = ~blocked
+    dist = np.full(blocked.shape, -1, dtype=np.int32)
+    frontier = np.zeros(blocked.shape, dtype=bool)
+    frontier[goal_y, goal_x] = True
+    seen = frontier.copy()
+    grown = np.empty_like(frontier)
+    step = 0
+    while frontier.any():
+        dist[frontier] = step
+        grown[:] = False
+        grown[1:, :] |= frontier[:-1, :]  # DOWN
+        grown[:-1, :] |= frontier[1:, :]  # UP
+        grown[:, 1:] |= frontier[:, :-1]  # RIGHT
+        grown[:, :-1] |= frontier[:, 1:]  # LEFT
+        frontier = grown & passable & ~seen
+        seen |= frontier
+        step += 1
+    return dist
+
+
+class LPAStar:
+    """
+    Lifelong Planning A* (Koenig, Likhachev & Furcy) over a Grid.
+
+    The search tree is rooted at the goal, which stays put until the food is
+    eaten, and grows toward the start (the snake's head). g/rhs are kept
+    between calls, so when obstacle or body cells change only the cells
+    whose cheapest route ran through them are expanded again. Moving onto a
+    cell costs 1, OBSTACLE_COST on obstacles and is impossible on blocked
+    (body) cells, the same costs astar uses.
+    """
+
+    def __init__(self, grid: Grid, goal: int, obstacles, blocked):
+        self.grid = grid
+        self.goal = goal
+        self.obstacles = set(obstacles)
+        self.blocked = set(blocked)
+        self.g = [INF] * grid.size
+        self.rhs = [INF] * grid.size
+        self.rhs[goal] = 0
+        self.km = 0  # key offset, only used by DStarLite
+        self.start = None  # start of the previous plan
+        self.heap = []
+        self.queued = {}  # cell -> its current key; heap entries with other keys are stale
+        # Running totals; a re-expansion is an expansion of a cell that had
+        # already been expanded, by this plan or an earlier one
+        self.expanded = 0
+        self.reexpanded = 0
+        self.settled = bytearray(grid.size)
+
+    def heuristic(self, cell):
+        # Manhattan distance from the current start
+        width = self.grid.width
+        return abs(cell % width - self.start % width) + abs(cell // width - self.start // width)
+
+    def cost(self, cell):
+        """Cost of moving onto cell."""
+        if cell in self.blocked:
+            return INF
+        return OBSTACLE_COST if cell in self.obstacles else 1
+
+    def key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self.heuristic(cell) + self.km, best)
+
+    def push(self, cell, key):
+        self.queued[cell] = key
+        heapq.heappush(self.heap, (key, cell))
+
+    def best_rhs(self, cell):
+        g = self.g
+        return min(self.cost(succ) + g[succ] for succ in self.grid.neighbors[cell])
+
+    def update_vertex(self, cell):
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell, self.key(cell))
+        else:
+            self.queued.pop(cell, None)
+
+    def compute_shortest_path(self):
+        g, rhs, heap, queued = self.g, self.rhs, self.heap, self.queued
+        neighbors = self.grid.neighbors
+        goal, start = self.goal, self.start
+        while heap:
+            k_old, cell = heap[0]
+            if queued.get(cell) != k_old:
+                heapq.heappop(heap)  # stale entry
+                continue
+            if not (k_old < self.key(start) or rhs[start] > g[start]):
+                break
+            heapq.heappop(heap)
+            k_new = self.key(cell)
+            if k_old < k_new:
+                self.push(cell, k_new)
+                continue
+            del queued[cell]
+            self.expanded += 1
+            if self.settled[cell]:
+                self.reexpanded += 1
+            self.settled[cell] = 1
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+                step = self.cost(cell)
+                for pred in neighbors[cell]:
+                    if pred != goal and step + g[cell] < rhs[pred]:
+                        rhs[pred] = step + g[cell]
+                        self.update_vertex(pred)
+            else:
+                g_old = g[cell]
+                g[cell] = INF
+                step = self.cost(cell)
+                for pred in neighbors[cell]:
+                    if pred != goal and rhs[pred] == step + g_old:
+                        rhs[pred] = self.best_rhs(pred)
+                    self.update_vertex(pred)
+                if cell != goal:
+                    rhs[cell] = self.best_rhs(cell)
+                self.update_vertex(cell)
+
+    def move_start(self, start):
+        # g and rhs don't depend on the start, only the keys do: rebuild the
+        # queue with keys for the new start
+        self.start = start
+        entries = [(self.key(cell), cell) for cell in self.queued]
+        heapq.heapify(entries)
+        self.heap = entries
+        self.queued = {cell: key for key, cell in entries}
+
+    def update_cells(self, blocked, obstacles):
+        """Repair the tree for every cell that joined or left blocked or obstacles."""
+        changed = (self.blocked ^ blocked) | (self.obstacles ^ obstacles)
+        g, rhs = self.g, self.rhs
+        neighbors = self.grid.neighbors
+        for cell in changed:
+            old_cost = self.cost(cell)
+            if cell in blocked:
+                self.blocked.add(cell)
+            else:
+                self.blocked.discard(cell)
+            if cell in obstacles:
+                self.obstacles.add(cell)
+            else:
+                self.obstacles.discard(cell)
+            new_cost = self.cost(cell)
+            # Only the edges into cell changed
+            for pred in neighbors[cell]:
+                if pred == self.goal:
+                    continue
+                if new_cost < old_cost:
+                    rhs[pred] = min(rhs[pred], new_cost + g[cell])
+                elif rhs[pred] == old_cost + g[cell]:
+                    rhs[pred] = self.best_rhs(pred)
+                self.update_vertex(pred)
+
+    def plan(self, start, blocked, obstacles) -> List[int]:
+        """
+        Move the start, apply the new blocked and obstacle cells and return
+        a cheapest path start..goal, or [] if the goal can't be reached.
+        """
+        if self.start is None:
+            self.start = start
+            self.push(self.goal, self.key(self.goal))
+        elif start != self.start:
+            self.move_start(start)
+        self.update_cells(blocked, obstacles)
+        self.compute_shortest_path()
+
+        g = self.g
+        if self.rhs[start] == INF:
+            return []
+        neighbors = self.grid.neighbors
+        path = [start]
+        cell = start
+        while cell != self.goal and len(path) <= self.grid.size:
+            cell = min(neighbors[cell], key=lambda succ: self.cost(succ) + g[succ])
+            path.append(cell)
+        return path if cell == self.goal else []
+
+
+class DStarLite(LPAStar):
+    """
+    D* Lite (Koenig & Likhachev): LPA* for a start that keeps moving.
+
+    Instead of re-keying the whole queue when the head moves, every key
+    gets an offset km that grows by the heuristic change, so moving the
+    start is O(1) and keys that became too small are fixed as they reach
+    the top of the queue.
+    """
+
+    def move_start(self, start):
+        self.km += self.heuristic(start)  # still measured from the previous start
+        self.start = start
+
 
 class SearchBasedPlayer(Player):
-    def __init__(self, search_type=SearchType.BFS):
+    def __init__(self, search_type=SearchType.BFS, grid: Grid = None,
+                 deadline_ms: float = ANYTIME_DEADLINE_MS, max_expansions: int = None):
         super(SearchBasedPlayer, self).__init__()
         self.search_type = search_type
-
-    def bfs(self, start, goal, obstacles):
-        queue = deque([(start, [start])])
-        visited = set()
+        self.grid = grid if grid is not None else Grid()
+        # Budget of the anytime search: wall-clock ms and expanded cells
+        # (None for no limit)
+        self.deadline_ms = deadline_ms
+        self.max_expansions = max_expansions
+        # Distance field of the last goal/obstacle layout, see descend_distance_field
+        self.field_key = None
+        self.field: List[int] = []
+        # LPA* / D* Lite planner kept between ticks, see repair_plan
+        self.planner: LPAStar = None
+        # Running totals for benchmarking and tournaments
+        self.searches = 0
+        self.search_time = 0.0
+        self.nodes_expanded = 0
+        self.nodes_reexpanded = 0  # expansions repeated by the incremental planners
+        self.budget_misses = 0  # anytime searches cut short by their budget
+
+    # The searches below work on integer cells (see Grid): start and goal are
+    # cells, body and obstacles are sets of cells, and the returned path is a
+    # list of cells from start to goal. Each search records a flat parent
+    # array (which doubles as its visited set) and rebuilds the path only
+    # once the goal is reached.
+
+    def bfs(self, start, goal, body, obstacles):
+        neighbors = self.grid.neighbors
+        parent = [-1] * self.grid.size
+        parent[start] = start
+        queue = deque([start])
         while queue:
-            (current, path) = queue.popleft()
-            if current not in visited:
-                if current == goal:
-                    return path
-                visited.add(current)
-                for direction in Direction:
-                    next_pos = Position(current.x + direction.value[0], current.y + direction.value[1])
-                    if (not next_pos.check_bounds(GRID_WIDTH, GRID_HEIGHT) and
-                    next_pos not in visited and
+            current = queue.popleft()
+            self.nodes_expanded += 1
+            if current == goal:
+                return reconstruct_path(parent, goal)
+            for next_pos in neighbors[current]:
+                if (parent[next_pos] == -1 and
                     next_pos not in obstacles and
-                    next_pos not in snake.positions[1:]):  # Exclude the head from the snake's body positions
-                        queue.append((next_pos, path + [next_pos]))
+                    next_pos not in body):
+                    parent[next_pos] = current
+                    queue.append(next_pos)
+        return []
+
+    def bidirectional_bfs(self, start, goal, body, obstacles):
+        # Grows one BFS from the start and one from the goal, a whole level
+        # at a time and always on the side with the smaller frontier, until
+        # a level touches the other side's tree. Every touch in that level
+        # is checked so the shortest joined path wins. Returns the same
+        # start..goal cell list as bfs.
+        if start == goal:
+            return [start]
+        neighbors = self.grid.neighbors
+        size = self.grid.size
+        parents = ([-1] * size, [-1] * size)  # from the start, from the goal
+        depths = ([-1] * size, [-1] * size)
+        parents[0][start], parents[1][goal] = start, goal
+        depths[0][start] = depths[1][goal] = 0
+        frontiers = [[start], [goal]]
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, depth = parents[side], depths[side]
+            other_depth = depths[1 - side]
+            best = None  # (length, cell on this side, cell on the other side)
+            next_frontier = []
+            for current in frontiers[side]:
+                self.nodes_expanded += 1
+                for next_pos in neighbors[current]:
+                    if other_depth[next_pos] != -1:
+                        length = depth[current] + 1 + other_depth[next_pos]
+                        if best is None or length < best[0]:
+                            best = (length, current, next_pos)
+                    elif (parent[next_pos] == -1 and
+                          next_pos not in obstacles and
+                          next_pos not in body):
+                        parent[next_pos] = current
+                        depth[next_pos] = depth[current] + 1
+                        next_frontier.append(next_pos)
+            if best is not None:
+                _, near, far = best
+                if side == 1:
+                    near, far = far, near
+                path = reconstruct_path(parents[0], near)
+                path.extend(reversed(reconstruct_path(parents[1], far)))
+                return path
+            frontiers[side] = next_frontier
         return []
 
-    def dfs(self, start, goal, snake, obstacles):
-        stack = [(start, [start])]
-        visited = set()
+    def dfs(self, start, goal, body, obstacles):
+        neighbors = self.grid.neighbors
+        parent = [-1] * self.grid.size
+        stack = [(start, start)]  # (cell, cell it was reached from)
         while stack:
-            current, path = stack.pop()
-            if current in visited:
+            current, came_from = stack.pop()
+            if parent[current] != -1:
                 continue
-            visited.add(current)
+            parent[current] = came_from
+            self.nodes_expanded += 1
             if current == goal:
-                return path
-            for direction in Direction:
-                next_pos = Position(current.x + direction.value[0], current.y + direction.value[1])
-                # Integrated the validity check here
-                if (not next_pos.check_bounds(GRID_WIDTH, GRID_HEIGHT) and
-                    next_pos not in visited and
+                return reconstruct_path(parent, goal)
+            for next_pos in neighbors[current]:
+                if (parent[next_pos] == -1 and
                     next_pos not in obstacles and
-                    next_pos not in snake.positions[1:]):  # Exclude the head from the snake's body positions
-                    stack.append((next_pos, path + [next_pos]))
+                    next_pos not in body):
+                    stack.append((next_pos, current))
         return []
     
-    def dijkstra(self, start, goal, snake, obstacles):
-        pq = PriorityQueue()
+    def dijkstra(self, start, goal, body, obstacles):
+        neighbors = self.grid.neighbors
+        parent = [-1] * self.grid.size
+        heap = [(0, 0, start, start)]  # Cost from start to start is 0
         counter = 0  # Unique sequence count
-        pq.put((0, counter, start, [start]))  # Cost from start to start is 0
-        visited = set()
-        obstacle_cost = 10  # Assign a high cost to moving onto an obstacle
-        while not pq.empty():
-            cost, _, current, path = pq.get()
-            if current in visited:
+        obstacle_cost = OBSTACLE_COST  # Assign a high cost to moving onto an obstacle
+        while heap:
+            cost, _, current, came_from = heapq.heappop(heap)
+            if parent[current] != -1:
                 continue
-            visited.add(current)
+            parent[current] = came_from
+            self.nodes_expanded += 1
             if current == goal:
-                return path
-            for direction in Direction:
-                next_pos = Position(current.x + direction.value[0], current.y + direction.value[1])
-                if next_pos in visited or next_pos in snake.positions:
+                return reconstruct_path(parent, goal)
+            for next_pos in neighbors[current]:
+                if parent[next_pos] != -1 or next_pos in body:
                     continue
                 new_cost = cost + (obstacle_cost if next_pos in obstacles else 1)  # High cost for obstacles
                 counter += 1
-                pq.put((new_cost, counter, next_pos, path + [next_pos]))
+                heapq.heappush(heap, (new_cost, counter, next_pos, current))
         return []
 
+    def dial(self, start, goal, body, obstacles):
+        # Dijkstra with Dial's bucket queue. Step costs are only 1 or
+        # OBSTACLE_COST, so OBSTACLE_COST + 1 circular buckets hold every
+        # pending cost and each push/pop is O(1). Buckets are FIFO, which
+        # keeps the expansion order (and the path) identical to dijkstra.
+        neighbors = self.grid.neighbors
+        parent = [-1] * self.grid.size
+        obstacle_cost = OBSTACLE_COST
+        num_buckets = obstacle_cost + 1
+        buckets = [deque() for _ in range(num_buckets)]
+        buckets[0].append((start, start))
+        pending = 1
+        cost = 0
+        while pending:
+            bucket = buckets[cost % num_buckets]
+            while bucket:
+                current, came_from = bucket.popleft()
+                pending -= 1
+                if parent[current] != -1:
+                    continue
+                parent[current] = came_from
+                self.nodes_expanded += 1
+                if current == goal:
+                    return reconstruct_path(parent, goal)
+                for next_pos in neighbors[current]:
+                    if parent[next_pos] != -1 or next_pos in body:
+                        continue
+                    step = obstacle_cost if next_pos in obstacles else 1
+                    buckets[(cost + step) % num_buckets].append((next_pos, current))
+                    pending += 1
+            cost += 1
+        return []
+
+    def descend_distance_field(self, start, goal, body, obstacles, obstacle_bits=None):
+        # Returns a one-step path [start, next] toward goal, stepping to the
+        # free neighbor with the smallest distance to the goal. The field
+        # only depends on the goal and the obstacles, so it is recomputed
+        # when one of those changes rather than on every call. obstacle_bits
+        # is the ObstacleIndex bitmap of the same cells, an exact cache key
+        # that is already up to date; without it the key is a frozenset copy.
+        grid = self.grid
+        if obstacle_bits is None:
+            obstacle_bits = frozenset(obstacles)
+        key = (goal, obstacle_bits)
+        if key != self.field_key:
+            field = distance_field(obstacles, grid.width, grid.height, goal)
+            self.field = field.ravel().tolist()
+            self.field_key = key
+            self.nodes_expanded += int((field >= 0).sum())
+
+        field = self.field
+        best, best_dist = -1, -1
+        for next_pos in grid.neighbors[start]:
+            dist = field[next_pos]
+            if dist < 0 or next_pos in body:
+                continue
+            if best_dist < 0 or dist < best_dist:
+                best, best_dist = next_pos, dist
+        return [start, best] if best >= 0 else []
+
     def heuristic(self, a, b):
         # Use Manhattan distance as the heuristic
-        return abs(a.x - b.x) + abs(a.y - b.y)
+        width = self.grid.width
+        return abs(a % width - b % width) + abs(a // width - b // width)
 
-    def astar(self, start, goal, snake, obstacles):
-        pq = PriorityQueue()
+    def astar(self, start, goal, body, obstacles):
+        neighbors = self.grid.neighbors
+        parent = [-1] * self.grid.size
+        heap = [(0, 0, start, start)]  # Initial priority, counter, position, parent
         counter = 0  # Unique sequence count
-        pq.put((0, counter, start, [start]))  # Initial priority, counter, position, path
-        visited = set()
         cost_so_far = {start: 0}
-        obstacle_cost = 10  # Assign a high cost to moving onto an obstacle
+        obstacle_cost = OBSTACLE_COST  # Assign a high cost to moving onto an obstacle
 
-        while not pq.empty():
-            _, _, current, path = pq.get()
-            if current in visited:
+        while heap:
+            _, _, current, came_from = heapq.heappop(heap)
+            if parent[current] != -1:
                 continue
-            visited.add(current)
+            parent[current] = came_from
+            self.nodes_expanded += 1
             if current == goal:
-                return path
+                return reconstruct_path(parent, goal)
 
-            for direction in Direction:
-                next_pos = Position(current.x + direction.value[0], current.y + direction.value[1])
-                if next_pos in visited or next_pos in snake.positions:
+            for next_pos in neighbors[current]:
+                if parent[next_pos] != -1 or next_pos in body:
                     continue
 
                 new_cost = cost_so_far[current] + (obstacle_cost if next_pos in obstacles else 1)
@@ -388,29 +1212,269 @@ class SearchBasedPlayer(Player):
                     cost_so_far[next_pos] = new_cost
                     priority = new_cost + self.heuristic(next_pos, goal)
                     counter += 1
-                    pq.put((priority, counter, next_pos, path + [next_pos]))
+                    heapq.heappush(heap, (priority, counter, next_pos, current))
 
         return []
 
+    def repair_plan(self, planner_type, start, goal, body, obstacles):
+        # Repairs the previous plan instead of searching from scratch. The
+        # planner is only rebuilt when the goal changes; a moving head, body
+        # and obstacles just update the cells that changed.
+        planner = self.planner
+        if type(planner) is not planner_type or planner.goal != goal:
+            planner = self.planner = planner_type(self.grid, goal, obstacles, body)
+        expanded, reexpanded = planner.expanded, planner.reexpanded
+        path = planner.plan(start, body, obstacles)
+        self.nodes_expanded += planner.expanded - expanded
+        self.nodes_reexpanded += planner.reexpanded - reexpanded
+        return path
+
+    def lpa_star(self, start, goal, body, obstacles):
+        return self.repair_plan(LPAStar, start, goal, body, obstacles)
+
+    def dstar_lite(self, start, goal, body, obstacles):
+        return self.repair_plan(DStarLite, start, goal, body, obstacles)
+
+    def jps(self, start, goal, body, obstacles):
+        # Jump point search on the 4-connected grid, with obstacles and body
+        # blocked (every step costs 1). Paths are kept in a canonical
+        # "vertical first" form: a horizontal run only turns where a
+        # forced neighbor appears (a free cell above or below whose own left
+        # or right neighbor behind us is blocked), while a vertical run may
+        # turn at any row, so each of its cells scans both ways. Only the
+        # cells where a run stops (jump points) go through the heap. A state
+        # is a jump point plus the direction it was reached in, since that
+        # decides which runs continue from it.
+        width, size = self.grid.width, self.grid.size
+        blocked = bytearray(size)
+        for cell in body:
+            blocked[cell] = 1
+        for cell in obstacles:
+            blocked[cell] = 1
+        blocked[start] = 0  # the head is in the body
+        steps = (1, -1, width, -width)  # right, left, down, up
+
+        # Where a horizontal run has to stop, one byte per cell: blocked
+        # cells, the goal and cells with a forced neighbor. Computed for the
+        # whole board at once by treating the bytes as lanes of a big int
+        # (shifting by 8 * width bytes moves a lane one row), so each run is
+        # a single bytearray.find.
+        lanes = int.from_bytes(blocked, "little")
+        ones = int.from_bytes(b"\x01" * size, "little")
+        row = 8 * width
+        stop_right = ((lanes << row + 8) & ((lanes << row) ^ ones) |
+                      (lanes >> row - 8) & ((lanes >> row) ^ ones) | lanes) & ones
+        stop_left = ((lanes << row - 8) & ((lanes << row) ^ ones) |
+                     (lanes >> row + 8) & ((lanes >> row) ^ ones) | lanes) & ones
+        stop_right = bytearray(stop_right.to_bytes(size, "little"))
+        stop_left = bytearray(stop_left.to_bytes(size, "little"))
+        stop_right[goal] = stop_left[goal] = 1
+
+        def run_horizontal(cell, step):
+            # Returns the next jump point from cell along its row, or -1
+            row_start = cell - cell % width
+            if step > 0:
+                stop = stop_right.find(1, cell + 1, row_start + width)
+            else:
+                stop = stop_left.rfind(1, row_start, cell)
+            if stop == -1 or blocked[stop]:
+                return -1
+            return stop
+
+        def run_vertical(cell, step):
+            # Returns the next jump point from cell along its column, or -1
+            while True:
+                cell += step
+                if cell < 0 or cell >= size or blocked[cell]:
+                    return -1
+                if (cell == goal or run_horizontal(cell, 1) != -1 or
+                        run_horizontal(cell, -1) != -1):
+                    return cell
+
+        # States are cell * 4 + direction index; the start is reached in no
+        # direction and continues in all four
+        first = start * 4
+        parent = {first: first}
+        cost_so_far = {first: 0}
+        closed = set()
+        heap = [(self.heuristic(start, goal), 0, first, -1)]
+        counter = 0
+        while heap:
+            _, _, state, direction = heapq.heappop(heap)
+            if state in closed:
+                continue
+            closed.add(state)
+            self.nodes_expanded += 1
+            cell = state // 4
+            if cell == goal:
+                jump_points = [cell]
+                while parent[state] != state:
+                    state = parent[state]
+                    jump_points.append(state // 4)
+                jump_points.reverse()
+                path = [start]
+                for a, b in zip(jump_points, jump_points[1:]):
+                    step = (1 if b > a else -1) if a // width == b // width else (width if b > a else -width)
+                    path.extend(range(a + step, b + step, step))
+                return path
+
+            if direction < 0:
+                directions = (0, 1, 2, 3)
+            elif direction < 2:
+                step = steps[direction]
+                directions = [direction]
+                up, down = cell - width, cell + width
+                if up >= 0 and not blocked[up] and blocked[up - step]:
+                    directions.append(3)
+                if down < size and not blocked[down] and blocked[down - step]:
+                    directions.append(2)
+            else:
+                directions = (direction, 0, 1)
+
+            for next_direction in directions:
+                step = steps[next_direction]
+                if next_direction < 2:
+                    jump_point = run_horizontal(cell, step)
+                else:
+                    jump_point = run_vertical(cell, step)
+                if jump_point == -1:
+                    continue
+                next_state = jump_point * 4 + next_direction
+                new_cost = cost_so_far[state] + (jump_point - cell) // step
+                if next_state not in cost_so_far or new_cost < cost_so_far[next_state]:
+                    cost_so_far[next_state] = new_cost
+                    parent[next_state] = state
+                    counter += 1
+                    priority = new_cost + self.heuristic(jump_point, goal)
+                    heapq.heappush(heap, (priority, counter, next_state, next_direction))
+        return []
+
+    def anytime(self, start, goal, body, obstacles):
+        # ARA*: a series of weighted A* searches, with the heuristic
+        # inflated by each weight in ANYTIME_WEIGHTS down to 1 (plain A*, an
+        # optimal path). Each search reuses the g values of the last one and
+        # only reopens the cells whose cost dropped after they were expanded.
+        # The budget is checked before every expansion: once deadline_ms is
+        # spent or max_expansions cells were expanded (either may be None),
+        # the best complete path so far is returned, or, if there is none
+        # yet, the route to the expanded cell closest to the goal. Only the
+        # expansion cap gives results that don't depend on machine load.
+        # Costs are the same as astar's.
+        if self.deadline_ms is not None:
+            deadline = time.perf_counter() + self.deadline_ms / 1000
+        else:
+            deadline = INF
+        expansions_left = self.max_expansions if self.max_expansions is not None else INF
+        neighbors = self.grid.neighbors
+        heuristic = self.heuristic
+        obstacle_cost = OBSTACLE_COST
+        # Dicts rather than flat arrays, so a search cut short by its budget
+        # never pays for setting up and freeing the whole board
+        g = {start: 0}
+        parent = {start: start}
+        closest, closest_h = start, heuristic(start, goal)
+        best = []
+        open_cells = {start}
+        incons = set()  # improved after being expanded in the current search
+        counter = 0
+
+        def out_of_budget():
+            self.budget_misses += 1
+            if best or closest == start:
+                return best
+            return reconstruct_path(parent, closest)
+
+        for weight in ANYTIME_WEIGHTS:
+            heap = []
+            for cell in open_cells | incons:
+                if time.perf_counter() >= deadline:
+                    return out_of_budget()
+                counter += 1
+                heap.append((g[cell] + weight * heuristic(cell, goal), counter, cell, g[cell]))
+            heapq.heapify(heap)
+            open_cells |= incons
+            incons = set()
+            closed = set()
+            while heap and heap[0][0] < g.get(goal, INF):
+                _, _, current, cost = heapq.heappop(heap)
+                if cost != g[current] or current in closed:
+                    continue  # stale entry
+                if expansions_left <= 0 or time.perf_counter() >= deadline:
+                    return out_of_budget()
+                expansions_left -= 1
+                closed.add(current)
+                open_cells.discard(current)
+                self.nodes_expanded += 1
+                h = heuristic(current, goal)
+                if h < closest_h:
+                    closest, closest_h = current, h
+                for next_pos in neighbors[current]:
+                    if next_pos in body:
+                        continue
+                    new_cost = cost + (obstacle_cost if next_pos in obstacles else 1)
+                    if new_cost < g.get(next_pos, INF):
+                        g[next_pos] = new_cost
+                        parent[next_pos] = current
+                        if next_pos in closed:
+                            incons.add(next_pos)
+                        else:
+                            open_cells.add(next_pos)
+                            counter += 1
+                            priority = new_cost + weight * heuristic(next_pos, goal)
+                            heapq.heappush(heap, (priority, counter, next_pos, new_cost))
+            if goal not in g:
+                return []  # the goal can't be reached
+            best = reconstruct_path(parent, goal)
+        return best
+
     def search_path(self, snake: Snake, food: Food, obstacles: Set[Obstacle]):
-        start = snake.get_head_position()
-        goal = food.position
+        begin = time.perf_counter()
+        grid = self.grid
+        start = grid.encode(snake.get_head_position())
+        goal = grid.encode(food.position)
+        # The snake's occupancy set is shared as is (it uses the same encoding
+        # as the default grid); it also holds the head, which is harmless
+        # because the head is the start cell
+        body = snake.occupied
+        if isinstance(obstacles, ObstacleIndex):
+            obstacle_cells, obstacle_bits = obstacles.cells, obstacles.bitmap
+        else:
+            obstacle_cells, obstacle_bits = grid.encode_all(ob.position for ob in obstacles), None
         path = []
-        obstacle_positions = {ob.position for ob in obstacles}
         if self.search_type == SearchType.BFS:
-            path = self.bfs(start, goal, obstacle_positions)
+            path = self.bfs(start, goal, body, obstacle_cells)
         elif self.search_type == SearchType.DFS:
-            path = self.dfs(start, goal, snake, obstacle_positions)
+            path = self.dfs(start, goal, body, obstacle_cells)
         elif self.search_type == SearchType.DIJKSTRA:
-            path = self.dijkstra(start, goal, snake, obstacle_positions)
+            path = self.dijkstra(start, goal, body, obstacle_cells)
         elif self.search_type == SearchType.ASTAR:
-            path = self.astar(start, goal, snake, obstacle_positions)
+            path = self.astar(start, goal, body, obstacle_cells)
+        elif self.search_type == SearchType.DIAL:
+            path = self.dial(start, goal, body, obstacle_cells)
+        elif self.search_type == SearchType.DISTANCE_FIELD:
+            path = self.descend_distance_field(start, goal, body, obstacle_cells, obstacle_bits)
+        elif self.search_type == SearchType.DSTAR_LITE:
+            path = self.dstar_lite(start, goal, body, obstacle_cells)
+        elif self.search_type == SearchType.LPA_STAR:
+            path = self.lpa_star(start, goal, body, obstacle_cells)
+        elif self.search_type == SearchType.JPS:
+            path = self.jps(start, goal, body, obstacle_cells)
+        elif self.search_type == SearchType.BIDIRECTIONAL_BFS:
+            path = self.bidirectional_bfs(start, goal, body, obstacle_cells)
+        elif self.search_type == SearchType.ANYTIME:
+            path = self.anytime(start, goal, body, obstacle_cells)
         
         if path:
-            self.visited = set(path)  # Update the visited nodes for drawing
-            self.chosen_path = self.positions_to_directions(path, snake.direction)
+            positions = [grid.decode(cell) for cell in path]
+            self.visited = set(positions)  # Update the visited nodes for drawing
+            directions = self.positions_to_directions(positions, snake.direction)
+            if self.search_type in REPLANNING_SEARCHES:
+                directions = directions[:1]  # replan on the next tick
+            self.chosen_path = deque(directions)
         else:
-            self.chosen_path = []
+            self.chosen_path = deque()
+        self.searches += 1
+        self.search_time += time.perf_counter() - begin
 
     def positions_to_directions(self, positions, current_direction):
         directions = []
@@ -423,16 +1487,189 @@ class SearchBasedPlayer(Player):
                 current_direction = direction
         return directions
 
-if __name__ == "__main__":
-    snake = Snake(WIDTH, HEIGHT, INIT_LENGTH)  # Make sure to use HEIGHT for the second parameter
 
+class VectorSnakeEnv:
+    """
+    N independent snake games stored as NumPy arrays and stepped together.
+
+    step() reproduces Snake.turn, Snake.move, Snake.eat and
+    Snake.hit_obstacle for every game at once. Each game has its own
+    obstacles, food, direction, score and a ring buffer of body cells
+    (y * width + x, head at head_slot), plus an occupancy array for O(1)
+    collision tests. Directions are indices into Direction (UP, DOWN, LEFT,
+    RIGHT); an action of -1 keeps the current direction.
+    """
+
+    DX = (0, 0, -1, 1)
+    DY = (-1, 1, 0, 0)
+    REVERSE = (1, 0, 3, 2)
+
+    def __init__(self, num_games: int, width: int = GRID_WIDTH, height: int = GRID_HEIGHT,
+                 init_length: int = INIT_LENGTH, num_obstacles: int = 40, seed=None):
+        if np is None:
+            raise ImportError("VectorSnakeEnv requires numpy")
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.init_length = init_length
+        # Snake.reset puts the head on the same fixed cell whatever the board size
+        start_x = start_y = GRID_SIDE // 2
+        if start_x >= width or start_y >= height:
+            raise ValueError(
+                f"board of {width}x{height} cells is too small: snakes start at "
+                f"({start_x}, {start_y}), so it needs at least {start_x + 1}x{start_y + 1}"
+            )
+        self.start = start_y * width + start_x
+        self.rng = np.random.default_rng(seed)
+        self.dx = np.array(self.DX)
+        self.dy = np.array(self.DY)
+        self.reverse = np.array(self.REVERSE)
+        self.games = np.arange(num_games)
+
+        # Food first, then obstacles on distinct cells, like SnakeGame. The
+        # snake's start cell is taken by then, so its key sorts last
+        keys = self.rng.random((num_games, self.size))
+        keys[:, self.start] = 2.0
+        cells = np.argsort(keys, axis=1)
+        self.food = cells[:, 0].copy()
+        self.obstacles = np.zeros((num_games, self.size), dtype=bool)
+        self.obstacles[self.games[:, None], cells[:, 1:num_obstacles + 1]] = True
+
+        self.body = np.zeros((num_games, self.size), dtype=np.int64)
+        self.occupied = np.zeros((num_games, self.size), dtype=bool)
+        self.head_slot = np.zeros(num_games, dtype=np.int64)
+        self.count = np.zeros(num_games, dtype=np.int64)
+        self.length = np.zeros(num_games, dtype=np.int64)
+        self.direction = np.zeros(num_games, dtype=np.int64)
+        self.score = np.zeros(num_games, dtype=np.int64)
+        self.has_reset = np.zeros(num_games, dtype=bool)
+        self.steps = 0
+        self.reset(self.games)
+
+    def reset(self, games):
+        """Snake.reset for the given game indices."""
+        if len(games) == 0:
+            return
+        self.occupied[games] = False
+        self.length[games] = self.init_length
+        self.head_slot[games] = 0
+        self.count[games] = 1
+        self.body[games, 0] = self.start
+        self.occupied[games, self.start] = True
+        self.direction[games] = self.rng.integers(0, 4, size=len(games))
+        self.score[games] = 0
+        self.has_reset[games] = True
+
+    def heads(self):
+        return self.body[self.games, self.head_slot]
+
+    def respawn_food(self, games):
+        # Uniform over cells that are neither obstacle nor body, which is
+        # where Food.randomize_position plus Snake.eat's retry loop ends up
+        keys = self.rng.random((len(games), self.size))
+        keys[self.obstacles[games] | self.occupied[games]] = -1.0
+        self.food[games] = keys.argmax(axis=1)
+
+    def step(self, actions=None):
+        """
+        Advance every game by one tick and return each game's score change.
+        actions holds one Direction index (or -1) per game.
+        """
+        games = self.games
+        if actions is not None:
+            actions = np.asarray(actions)
+            # Snake.turn: ignore reversing onto the body
+            allowed = (actions >= 0) & ~(
+                (self.length > 1) & (actions == self.reverse[self.direction])
+            )
+            self.direction = np.where(allowed, actions, self.direction)
+        score_before = self.score.copy()
+
+        # Snake.move
+        self.has_reset[:] = False
+        head = self.heads()
+        x = head % self.width + self.dx[self.direction]
+        y = head // self.width + self.dy[self.direction]
+        off_board = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        new = np.where(off_board, 0, y * self.width + x)
+        collided = off_board | self.occupied[games, new]
+
+        moving = games[~collided]
+        new = new[moving]
+        slot = (self.head_slot[moving] - 1) % self.size
+        self.body[moving, slot] = new
+        self.head_slot[moving] = slot
+        self.count[moving] += 1
+        self.occupied[moving, new] = True
+        while True:
+            over = moving[self.count[moving] > self.length[moving]]
+            if len(over) == 0:
+                break
+            tail = (self.head_slot[over] + self.count[over] - 1) % self.size
+            self.occupied[over, self.body[over, tail]] = False
+            self.count[over] -= 1
+        self.reset(games[collided])
+
+        # Snake.eat
+        head = self.heads()
+        ate = games[head == self.food]
+        self.length[ate] += 1
+        self.score[ate] += 1
+        self.respawn_food(ate)
+
+        # Snake.hit_obstacle
+        hit = games[self.obstacles[games, head]]
+        self.length[hit] -= 1
+        self.score[hit] -= 1
+        self.reset(hit[self.length[hit] == 0])
+
+        self.steps += self.num_games
+        return self.score - score_before
+
+    def greedy_actions(self):
+        """
+        Per game, the Direction that brings the head closer to the food,
+        ignoring the body and obstacles. Cheap policy for throughput tests.
+        """
+        head = self.heads()
+        dx = self.food % self.width - head % self.width
+        dy = self.food // self.width - head // self.width
+        horizontal = np.where(dx < 0, 2, 3)
+        vertical = np.where(dy < 0, 0, 1)
+        return np.where(dx != 0, horizontal, vertical)
+
+
+SEARCH_CHOICES = {
+    "bfs": SearchType.BFS,
+    "dfs": SearchType.DFS,
+    "dijkstra": SearchType.DIJKSTRA,
+    "astar": SearchType.ASTAR,
+    "dial": SearchType.DIAL,
+    "field": SearchType.DISTANCE_FIELD,
+    "dstar": SearchType.DSTAR_LITE,
+    "lpa": SearchType.LPA_STAR,
+    "jps": SearchType.JPS,
+    "bibfs": SearchType.BIDIRECTIONAL_BFS,
+    "anytime": SearchType.ANYTIME,
+}
+
+
+def ask_search_type() -> SearchType:
     # Ask the user for the search algorithm to use
     print("Select the search algorithm:")
     print("1 - BFS (Breadth-First Search)")
     print("2 - DFS (Depth-First Search)")
     print("3 - Dijkstra's Algorithm")
     print("4 - A* Search")
-    choice = input("Enter your choice (1-4): ")
+    print("5 - Dijkstra with Dial's bucket queue")
+    print("6 - Distance field descent (needs numpy)")
+    print("7 - D* Lite (incremental replanning)")
+    print("8 - Lifelong Planning A* (incremental replanning)")
+    print("9 - Jump Point Search")
+    print("10 - Bidirectional BFS")
+    print(f"11 - Anytime A* (ARA*, {ANYTIME_DEADLINE_MS:g} ms per search)")
+    choice = input("Enter your choice (1-11): ")
 
     # Map the user's choice to the corresponding search type
     search_type = SearchType.BFS  # Default to BFS
@@ -444,10 +1681,184 @@ if __name__ == "__main__":
         search_type = SearchType.DIJKSTRA
     elif choice == "4":
         search_type = SearchType.ASTAR
+    elif choice == "5":
+        search_type = SearchType.DIAL
+    elif choice == "6":
+        search_type = SearchType.DISTANCE_FIELD
+    elif choice == "7":
+        search_type = SearchType.DSTAR_LITE
+    elif choice == "8":
+        search_type = SearchType.LPA_STAR
+    elif choice == "9":
+        search_type = SearchType.JPS
+    elif choice == "10":
+        search_type = SearchType.BIDIRECTIONAL_BFS
+    elif choice == "11":
+        search_type = SearchType.ANYTIME
     else:
         print("Invalid choice. Using default BFS algorithm.")
+    return search_type
+
+
+TOURNAMENT_METRICS = (
+    "best_score", "final_score", "deaths", "mean_survival",
+    "mean_search_ms", "nodes_expanded", "nodes_reexpanded",
+)
+
+
+def play_tournament_game(job) -> dict:
+    """
+    Play one headless game for job = (search name, seed, steps,
+    max_expansions) and return its metrics. The game draws everything from
+    its own random.Random(seed) and the anytime search is limited by
+    max_expansions rather than a wall-clock deadline, so the result only
+    depends on the job, not on the worker that ran it or on machine load.
+    """
+    name, seed, steps, max_expansions = job
+    rng = random.Random(seed)
+    player = SearchBasedPlayer(
+        search_type=SEARCH_CHOICES[name], deadline_ms=None, max_expansions=max_expansions
+    )
+    engine = SimulationEngine(Snake(WIDTH, HEIGHT, INIT_LENGTH, rng), player, rng=rng)
+    engine.run(steps)
+    return {
+        "search": name,
+        "seed": seed,
+        "steps": steps,
+        "best_score": engine.best_score,
+        "final_score": engine.snake.score,
+        "deaths": engine.deaths,
+        "mean_survival": steps / (engine.deaths + 1),
+        "mean_search_ms": player.search_time / player.searches * 1000 if player.searches else 0.0,
+        "nodes_expanded": player.nodes_expanded,
+        "nodes_reexpanded": player.nodes_reexpanded,
+    }
+
+
+def run_tournament(names, games: int, steps: int, seed: int = 0, workers: int = None,
+                   max_expansions: int = ANYTIME_MAX_EXPANSIONS):
+    """
+    Play games seeded headless games of steps ticks for every search name
+    across a process pool. Game i uses seed + i for every algorithm, so each
+    algorithm faces the same boards; max_expansions budgets the anytime
+    search. Returns (per-game rows, per-algorithm means). Every metric
+    except mean_search_ms, which is wall-clock time, is identical for any
+    worker count.
+    """
+    jobs = [(name, seed + i, steps, max_expansions) for name in names for i in range(games)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(play_tournament_game, jobs))
+
+    summary = []
+    for name in names:
+        own = [row for row in rows if row["search"] == name]
+        means = {key: sum(row[key] for row in own) / len(own) for key in TOURNAMENT_METRICS}
+        summary.append({"search": name, "games": len(own), **means})
+    return rows, summary
+
+
+def write_tournament(path: str, rows, summary):
+    """Write the summary as CSV, or summary and per-game rows as JSON."""
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(summary[0]))
+            writer.writeheader()
+            writer.writerows(summary)
+    else:
+        with open(path, "w") as f:
+            json.dump({"summary": summary, "games": rows}, f, indent=2)
 
-    player = SearchBasedPlayer(search_type=search_type)
-    game = SnakeGame(snake, player)
-    game.run()
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI pathfinding snake game")
+    parser.add_argument(
+        "--search", choices=sorted(SEARCH_CHOICES),
+        help="search algorithm to use (prompted for when omitted)",
+    )
+    parser.add_argument(
+        "--headless", type=int, metavar="STEPS",
+        help="run STEPS ticks without pygame and report steps/second",
+    )
+    parser.add_argument(
+        "--tournament", type=int, metavar="GAMES",
+        help="play GAMES seeded headless games per algorithm and summarize them",
+    )
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=sorted(SEARCH_CHOICES),
+        help="algorithms in the tournament (default: all available)",
+    )
+    parser.add_argument("--steps", type=int, default=2000, help="ticks per tournament game")
+    parser.add_argument(
+        "--seed", type=int,
+        help="seed the game's RNG for a reproducible run (tournament: seed of game 0, default 0)",
+    )
+    parser.add_argument("--workers", type=int, help="tournament processes (default: all cores)")
+    parser.add_argument("--output", help="write the tournament summary to a .csv or .json file")
+    parser.add_argument(
+        "--deadline-ms", type=float,
+        help=f"time budget of each anytime search (default {ANYTIME_DEADLINE_MS:g}; "
+             "not allowed with --tournament, whose results must not depend on timing)",
+    )
+    parser.add_argument(
+        "--max-expansions", type=int,
+        help="expansion budget of each anytime search "
+             f"(default: none, {ANYTIME_MAX_EXPANSIONS} in tournaments)",
+    )
+    parser.add_argument(
+        "--tick-rate", type=float, default=FPS,
+        help=f"simulation ticks per second, 0 for unbounded (default {FPS})",
+    )
+    parser.add_argument(
+        "--frame-rate", type=float, default=FPS,
+        help=f"maximum rendered frames per second, 0 for uncapped (default {FPS})",
+    )
+    args = parser.parse_args()
+    if args.tick_rate < 0 or args.frame_rate < 0:
+        parser.error("--tick-rate and --frame-rate must be 0 or more")
+
+    if args.tournament is not None:
+        if args.tournament < 1:
+            parser.error("--tournament needs at least 1 game per algorithm")
+        if args.deadline_ms is not None:
+            parser.error("tournaments budget the anytime search with --max-expansions, "
+                         "not --deadline-ms")
+        if args.max_expansions is None:
+            args.max_expansions = ANYTIME_MAX_EXPANSIONS
+        names = args.algorithms or [
+            name for name, search_type in SEARCH_CHOICES.items()
+            if np is not None or search_type != SearchType.DISTANCE_FIELD
+        ]
+        rows, summary = run_tournament(
+            names, args.tournament, args.steps, args.seed or 0, args.workers,
+            args.max_expansions,
+        )
+        print(f"{'search':10}" + "".join(f"{key:>18}" for key in TOURNAMENT_METRICS))
+        for entry in summary:
+            print(f"{entry['search']:10}" + "".join(f"{entry[key]:18.2f}" for key in TOURNAMENT_METRICS))
+        if args.output:
+            write_tournament(args.output, rows, summary)
+        sys.exit()
+
+    rng = random.Random(args.seed) if args.seed is not None else None
+    snake = Snake(WIDTH, HEIGHT, INIT_LENGTH, rng)  # Make sure to use HEIGHT for the second parameter
+
+    if args.search:
+        search_type = SEARCH_CHOICES[args.search]
+    else:
+        search_type = ask_search_type()
+
+    if args.deadline_ms is None:
+        args.deadline_ms = ANYTIME_DEADLINE_MS
+    player = SearchBasedPlayer(
+        search_type=search_type, deadline_ms=args.deadline_ms, max_expansions=args.max_expansions
+    )
+    if args.headless:
+        engine = SimulationEngine(snake, player, rng=rng)
+        engine.run(args.headless)
+        print(
+            f"{engine.steps} steps in {engine.elapsed:.3f}s "
+            f"({engine.steps_per_second:.0f} steps/s), score {snake.score}"
+        )
+    else:
+        game = SnakeGame(snake, player, rng, args.tick_rate, args.frame_rate)
+        game.run()
@@ -0,0 +1,334 @@
+"""
+Randomized equivalence checks for the searches and simulators in snake.py.
+
+Run with ``python -m pytest``. Every check compares a faster or incremental
+implementation against a simpler one on seeded random boards.
+"""
+import random
+
+import pytest
+
+from snake import (
+    GRID_HEIGHT, GRID_WIDTH, INIT_LENGTH, OBSTACLE_COST, WIDTH, HEIGHT, Bitboard, Board,
+    Direction, Food, Grid, Obstacle, ObstacleIndex, Position, SearchBasedPlayer, SearchType,
+    SimulationEngine, Snake, VectorSnakeEnv, distance_field, run_tournament,
+)
+
+
+def path_cost(path, obstacles):
+    """Cost of a path under the searches' step costs."""
+    return sum(OBSTACLE_COST if cell in obstacles else 1 for cell in path[1:])
+
+
+def assert_valid_path(grid, path, start, goal, blocked):
+    assert path[0] == start and path[-1] == goal
+    assert all(b in grid.neighbors[a] for a, b in zip(path, path[1:]))
+    assert not any(cell in blocked for cell in path[1:])
+
+
+def random_walls_case(rng, size):
+    """
+    A random board, possibly not square, with a random share of its cells
+    walled off by obstacles and body. Returns (grid, start, goal, body,
+    obstacles). The start is in the body, as the head is in a game.
+    """
+    grid = Grid(size, rng.randint(3, size))
+    ratio = rng.choice([0, 0.05, 0.15, 0.3, 0.45])
+    cells = rng.sample(range(grid.size), int(grid.size * ratio) + 2)
+    start, goal = cells[0], cells[1]
+    obstacles = {cell for cell in cells[2:] if rng.random() < 0.5}
+    body = set(cells[2:]) - obstacles | {start}
+    return grid, start, goal, body, obstacles
+
+
+class StubNode:
+    """Food or obstacle stand-in whose position is set from the outside."""
+
+    def __init__(self, position, respawn=None):
+        self.position = position
+        self.respawn = respawn
+
+    def randomize_position(self):
+        self.respawn(self)
+
+
+def test_vector_env_keeps_start_cell_free():
+    pytest.importorskip("numpy")
+    env = VectorSnakeEnv(2000, seed=0)
+    assert not env.obstacles[:, env.start].any()
+    assert not (env.food == env.start).any()
+
+
+@pytest.mark.parametrize("width, height", [(10, 10), (30, 5)])
+def test_vector_env_rejects_boards_without_the_start_cell(width, height):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        VectorSnakeEnv(4, width=width, height=height)
+
+
+@pytest.mark.parametrize("num_obstacles, width, height", [
+    (0, GRID_WIDTH, GRID_HEIGHT),
+    (40, GRID_WIDTH, GRID_HEIGHT),
+    (40, 30, 15),
+])
+def test_vector_env_matches_scalar_snakes(num_obstacles, width, height):
+    np = pytest.importorskip("numpy")
+    num_games = 30
+    env = VectorSnakeEnv(num_games, width, height, seed=1, num_obstacles=num_obstacles)
+    width = env.width
+    directions = list(Direction)
+
+    def position(cell):
+        return Position(int(cell) % width, int(cell) // width)
+
+    snakes, foods, obstacles = [], [], []
+    for game in range(num_games):
+        snake = Snake(WIDTH, HEIGHT, INIT_LENGTH)
+        snake.set_board(Board(width, height))
+        snake.direction = directions[env.direction[game]]
+        snakes.append(snake)
+        # The env has already respawned its food by the time Snake.eat asks
+        foods.append(StubNode(
+            position(env.food[game]),
+            lambda food, game=game: setattr(food, "position", position(env.food[game])),
+        ))
+        obstacles.append({
+            int(cell): StubNode(position(cell)) for cell in np.flatnonzero(env.obstacles[game])
+        })
+
+    rng = random.Random(0)
+    for tick in range(1500):
+        if tick % 5:
+            actions = [int(a) if rng.random() < 0.9 else -1 for a in env.greedy_actions()]
+        else:
+            actions = [rng.choice([-1, -1, 0, 1, 2, 3]) for _ in range(num_games)]
+        env.step(actions)
+        for game, snake in enumerate(snakes):
+            if actions[game] >= 0:
+                snake.turn(directions[actions[game]])
+            snake.move()
+            snake.eat(foods[game])
+            ob = obstacles[game].get(snake.grid.encode(snake.get_head_position()))
+            if ob is not None:
+                snake.hit_obstacle(ob)
+            if env.has_reset[game]:
+                # Both draw a random direction on reset, from different RNGs
+                snake.direction = directions[env.direction[game]]
+
+            body = [
+                int(env.body[game, (env.head_slot[game] + i) % env.size])
+                for i in range(env.count[game])
+            ]
+            assert body == [snake.grid.encode(p) for p in snake.positions]
+            assert snake.length == env.length[game]
+            assert snake.score == env.score[game]
+            assert snake.hasReset == env.has_reset[game]
+            assert set(np.flatnonzero(env.occupied[game])) == snake.occupied
+
+
+@pytest.mark.parametrize("method", ["lpa_star", "dstar_lite"])
+@pytest.mark.parametrize("goal_jumps", [False, True])
+def test_incremental_planners_match_astar_as_the_board_changes(method, goal_jumps):
+    # The head wanders while obstacles and body cells change on every tick;
+    # with goal_jumps the food also moves every 15 ticks. Every repaired
+    # plan must cost as much as a fresh astar
+    for size in (10, 30):
+        for seed in range(10):
+            rng = random.Random(seed)
+            grid = Grid(size, size)
+            player = SearchBasedPlayer(grid=grid)
+            search = getattr(player, method)
+            reference = SearchBasedPlayer(grid=grid)
+            cells = rng.sample(range(grid.size), grid.size // 4)
+            goal, obstacles = cells[0], set(cells[1:grid.size // 10])
+            body = set(cells[grid.size // 10:])
+            start = rng.randrange(grid.size)
+            for tick in range(40):
+                for _ in range(rng.randint(0, 6)):
+                    body ^= {rng.randrange(grid.size)}
+                for _ in range(rng.randint(0, 3)):
+                    obstacles ^= {rng.randrange(grid.size)}
+                if goal_jumps and tick % 15 == 14:
+                    goal = rng.randrange(grid.size)
+                start = rng.choice(grid.neighbors[start])
+                blocked = (body | {start}) - {goal}  # the head is part of the body
+                path = search(start, goal, blocked, obstacles)
+                expected = reference.astar(start, goal, blocked, obstacles)
+                assert bool(path) == bool(expected), (size, seed, tick)
+                if path:
+                    assert_valid_path(grid, path, start, goal, blocked)
+                    assert path_cost(path, obstacles) == path_cost(expected, obstacles)
+            assert 0 < player.nodes_reexpanded < player.nodes_expanded
+
+
+@pytest.mark.parametrize("method, reference, compare", [
+    ("jps", "bfs", "length"),
+    ("bidirectional_bfs", "bfs", "length"),
+    # Dial's FIFO buckets expand cells in dijkstra's order, so even the
+    # tie-breaking between equal-cost paths is the same
+    ("dial", "dijkstra", "path"),
+    # Without a budget the anytime search ends with its weight-1 pass
+    ("anytime", "astar", "cost"),
+])
+def test_search_matches_reference(method, reference, compare):
+    rng = random.Random(method)
+    for size in (5, 8, 13, 30) * 60:
+        grid, start, goal, body, obstacles = random_walls_case(rng, size)
+        player = SearchBasedPlayer(grid=grid, deadline_ms=None)
+        path = getattr(player, method)(start, goal, body, obstacles)
+        expected = getattr(player, reference)(start, goal, body, obstacles)
+        if compare == "path":
+            assert path == expected
+        elif compare == "length":
+            assert len(path) == len(expected)
+            if path:
+                assert_valid_path(grid, path, start, goal, body | obstacles)
+        else:
+            assert bool(path) == bool(expected)
+            if path:
+                assert_valid_path(grid, path, start, goal, body)
+                assert path_cost(path, obstacles) == path_cost(expected, obstacles)
+        assert player.budget_misses == 0
+
+
+def test_anytime_expansion_budget_is_deterministic():
+    grid = Grid(60, 60)
+    rng = random.Random(0)
+    obstacles = set(rng.sample(range(1, grid.size - 1), grid.size // 4))
+    results = []
+    for _ in range(2):
+        player = SearchBasedPlayer(grid=grid, deadline_ms=None, max_expansions=50)
+        results.append(player.anytime(0, grid.size - 1, {0}, obstacles))
+        assert player.budget_misses == 1
+        assert player.nodes_expanded == 50
+    path = results[0]
+    assert results[0] == results[1]
+    # Out of budget before reaching the goal: a route toward it instead
+    assert path and path[0] == 0 and path[-1] != grid.size - 1
+    assert all(b in grid.neighbors[a] for a, b in zip(path, path[1:]))
+
+
+def test_bitboard_shortest_path_matches_bfs():
+    rng = random.Random(11)
+    for size in (5, 8, 13, 30) * 60:
+        grid, start, goal, body, obstacles = random_walls_case(rng, size)
+        board = Bitboard(grid.width, grid.height)
+        for cell in body:
+            board.body |= 1 << cell
+        for cell in obstacles:
+            board.obstacles |= 1 << cell
+        path = board.shortest_path(start, goal)
+        expected = SearchBasedPlayer(grid=grid).bfs(start, goal, body, obstacles)
+        assert len(path) == len(expected)
+        assert board.reachable(start, goal) == bool(expected)
+        if path:
+            assert_valid_path(grid, path, start, goal, body | obstacles)
+
+
+def test_bitboard_from_game_uses_the_board_size():
+    rng = random.Random(0)
+    board = Board(30, 17)
+    snake = Snake(WIDTH, HEIGHT, INIT_LENGTH, rng)
+    snake.set_board(board)
+    food = Food(board, rng)
+    obstacles = ObstacleIndex((Obstacle(board, rng) for _ in range(40)), grid=board.grid)
+
+    bits = Bitboard.from_game(snake, food, obstacles)
+    assert (bits.width, bits.height) == (30, 17)
+    assert bits.body == sum(1 << cell for cell in snake.occupied)
+    assert bits.food == 1 << board.grid.encode(food.position)
+    assert bits.obstacles == sum(1 << cell for cell in obstacles.cells)
+    # Column masks must match the 30-wide board: cells in the last column
+    # never spill into the next row
+    head = board.grid.encode(snake.get_head_position())
+    path = bits.shortest_path(head, board.grid.encode(food.position))
+    expected = SearchBasedPlayer(grid=board.grid).bfs(
+        head, board.grid.encode(food.position), snake.occupied, obstacles.cells
+    )
+    assert len(path) == len(expected)
+    assert all(b in board.grid.neighbors[a] for a, b in zip(path, path[1:]))
+
+
+def test_distance_field_matches_bfs_distances():
+    pytest.importorskip("numpy")
+    rng = random.Random(12)
+    for size in (5, 8, 13, 30) * 30:
+        grid, _, goal, body, obstacles = random_walls_case(rng, size)
+        blocked = body | obstacles
+        field = distance_field(blocked, grid.width, grid.height, goal).ravel().tolist()
+        player = SearchBasedPlayer(grid=grid)
+        for cell in rng.sample(range(grid.size), min(grid.size, 40)):
+            if cell == goal:
+                assert field[cell] == 0
+            elif cell in blocked:
+                assert field[cell] == -1
+            else:
+                path = player.bfs(cell, goal, blocked - {goal}, set())
+                assert field[cell] == (len(path) - 1 if path else -1)
+
+
+def engine_trace(search_type, seed, steps=300):
+    rng = random.Random(seed)
+    engine = SimulationEngine(
+        Snake(WIDTH, HEIGHT, INIT_LENGTH, rng), SearchBasedPlayer(search_type), rng=rng
+    )
+    trace = [sorted(engine.obstacles.cells)]
+    for _ in range(steps):
+        engine.step()
+        trace.append((
+            list(engine.snake.positions), engine.food.position, engine.snake.score,
+            engine.deaths,
+        ))
+    return trace
+
+
+@pytest.mark.parametrize("search_type", [SearchType.BFS, SearchType.ASTAR, SearchType.DFS])
+def test_seeded_engines_replay_the_same_game(search_type):
+    for seed in range(3):
+        assert engine_trace(search_type, seed) == engine_trace(search_type, seed)
+    assert engine_trace(search_type, 0) != engine_trace(search_type, 1)
+
+
+def test_tournament_results_do_not_depend_on_worker_count():
+    names = ["bfs", "astar", "anytime"]
+    results = []
+    for workers in (1, 2):
+        rows, summary = run_tournament(names, games=2, steps=150, seed=3, workers=workers)
+        for row in rows + summary:
+            del row["mean_search_ms"]  # wall-clock time
+        results.append((rows, summary))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("search_type", [SearchType.ASTAR, SearchType.DFS])
+def test_board_free_cells_track_the_pieces(search_type):
+    rng = random.Random(16)
+    engine = SimulationEngine(
+        Snake(WIDTH, HEIGHT, INIT_LENGTH, rng), SearchBasedPlayer(search_type), rng=rng
+    )
+    board = engine.board
+    every_cell = set(range(board.grid.size))
+    for tick in range(1500):
+        engine.step()
+        taken = engine.snake.occupied | engine.obstacles.cells
+        taken.add(board.grid.encode(engine.food.position))
+        assert set(board.cells) == every_cell - taken, tick
+        assert len(board.cells) == len(set(board.cells))
+        assert all(board.cells[board.slot[cell]] == cell for cell in board.cells)
+    assert engine.deaths and engine.best_score
+
+
+def test_board_sample_fails_once_the_board_is_full():
+    board = Board(2, 2)
+    for cell in range(4):
+        board.take(cell)
+    board.take(2)  # overlapping pieces
+    with pytest.raises(IndexError):
+        board.sample()
+    with pytest.raises(IndexError):
+        Food(board)
+    board.release(2)
+    with pytest.raises(IndexError):
+        board.sample()
+    board.release(2)
+    assert board.sample() == 2